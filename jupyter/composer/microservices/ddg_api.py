@@ -8,21 +8,26 @@ Improvements:
 """
 import os
 import sys
+import json
+import time
 from typing import Optional, List, Dict, Any
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Request, Query
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field, validator
 
 from ddg_cache import (
-    cached_ddg_search, quick_search, search_and_summarize,
-    get_cache_stats, clear_cache, get_cached_result
+    cached_ddg_search, stream_ddg_search, batch_ddg_search, quick_search, search_and_summarize,
+    get_cache_stats, clear_cache, get_cached_result, shutdown_cache,
+    warm_up_embedder, get_runtime_stats, get_cache_sweeper, set_search_backend,
+    get_refresh_scheduler, get_refresher, load_warmup_queries, get_stats_reconciler
 )
 
 sys.path.append('/dli/task/composer/microservices')
 from observability import get_observability
 logger, tracer, _, traced = get_observability("ddg-api")
+from ddg_metrics import HTTP_SECONDS, render_metrics
 
 # ============================================================================
 # Request/Response Models
@@ -35,6 +40,8 @@ class SearchRequest(BaseModel):
     use_cache: bool = Field(True, description="Enable cache lookup")
     similarity_threshold: float = Field(0.95, ge=0.5, le=1.0, description="Semantic similarity threshold")
     scrape_content: bool = Field(False, description="Scrape full content from URLs")
+    scrape_deadline: Optional[float] = Field(None, ge=0, le=300, description="Seconds to wait for pages (0 = all; default DDG_SCRAPE_DEADLINE); the rest are cached in the background")
+    force_refresh: bool = Field(False, description="Skip the cache lookup and replace the cached entry with live results")
     summarize_each: bool = Field(False, description="Generate summary for each result")
     summarize_all: bool = Field(False, description="Generate aggregate summary")
     use_llm_summary: bool = Field(False, description="Use LLM for summarization")
@@ -111,17 +118,57 @@ async def lifespan(app: FastAPI):
     """Initialize on startup, cleanup on shutdown"""
     logger.info("🚀 Starting DDG Cache API...")
     
+    # DDG_SEARCH_BACKEND=fixtures serves search results and pages from DDG_FIXTURES_DIR (offline)
+    backend = os.getenv("DDG_SEARCH_BACKEND", "ddg").lower()
+    if backend == "fixtures":
+        from ddg_fixtures import LocalFixtureBackend
+        fixtures = LocalFixtureBackend.from_env()
+        set_search_backend(fixtures)
+        logger.info(f"✓ Search backend: fixtures from {os.path.abspath(fixtures.root)}")
+    elif backend != "ddg":
+        logger.warning(f"✗ Unknown DDG_SEARCH_BACKEND={backend!r} - using live DuckDuckGo")
+    
     try:
-        from ddg_cache import init_database
+        from ddg_cache import init_database, load_vector_index, uses_pgvector
         await init_database()
         stats = await get_cache_stats()
         logger.info(f"✓ Database ready: {stats['total_queries']} cached queries")
+        if uses_pgvector():
+            logger.info("✓ Similarity search: pgvector (server-side)")
+        else:
+            indexed = await load_vector_index()
+            logger.info(f"✓ Vector index loaded: {indexed} embeddings")
     except Exception as e:
         logger.error(f"✗ Database init failed: {e}", exc_info=True)
     
+    if await warm_up_embedder():
+        logger.info("✓ Embedding model warmed up")
+    else:
+        logger.warning("✗ Embedding model unavailable - semantic cache disabled")
+    
+    sweeper = get_cache_sweeper()
+    sweeper.start()
+    if sweeper.running:
+        logger.info(f"✓ Cache sweeper running every {sweeper.interval:.0f}s")
+    get_stats_reconciler().start()  # Keeps /health and /stats counters in step with other writers
+    
+    # Refresh-ahead for hot entries; warm-up queries run on its first pass, right after startup
+    warmup = load_warmup_queries()
+    get_refresher().warm_up_queue.extend(warmup)
+    refresher = get_refresh_scheduler()
+    refresher.start(delay=0 if warmup else None)
+    if refresher.running:
+        logger.info(f"✓ Refresh-ahead running every {refresher.interval:.0f}s ({len(warmup)} warm-up queries)")
+    elif warmup:
+        logger.warning("✗ Warm-up queries ignored: refresh-ahead disabled (DDG_REFRESH_INTERVAL=0)")
+    if refresher.running and get_refresher().max_age_seconds <= 0 and int(os.getenv("DDG_CACHE_TTL_SECONDS", "0")) <= 0:
+        logger.warning("✗ Refresh-ahead has nothing to do: entries never expire (DDG_CACHE_TTL_SECONDS=0) "
+                       "and DDG_REFRESH_MAX_AGE_SECONDS=0")
+    
     yield
     
     logger.info("👋 Shutting down DDG Cache API")
+    await shutdown_cache()
 
 app = FastAPI(
     title="DDG Cache API",
@@ -141,6 +188,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def record_latency(request: Request, call_next):
+    """Per-route latency histogram (streaming responses: time until the response starts)"""
+    start, status = time.perf_counter(), 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = getattr(request.scope.get("route"), "path", "unmatched")
+        HTTP_SECONDS.observe(time.perf_counter() - start, method=request.method, route=route, status=status)
+
 # ============================================================================
 # Error Handling
 # ============================================================================
@@ -194,7 +253,9 @@ async def root():
         "docs": "/docs",
         "redoc": "/redoc",
         "health": "/health",
-        "stats": "/stats"
+        "stats": "/stats",
+        "runtime_stats": "/stats/runtime",
+        "metrics": "/metrics"
     }
 
 @app.get("/health", response_model=HealthResponse, tags=["Monitoring"])
@@ -230,6 +291,16 @@ async def stats():
         logger.error(f"Stats retrieval failed: {e}", exc_info=True)
         raise APIError(f"Failed to retrieve stats: {str(e)}", status_code=500)
 
+@app.get("/stats/runtime", tags=["Monitoring"])
+async def runtime_stats():
+    """In-process worker pool, embedder and index stats (queue depth, wait times, ...)"""
+    return get_runtime_stats()
+
+@app.get("/metrics", response_class=PlainTextResponse, tags=["Monitoring"])
+async def metrics():
+    """Prometheus text exposition of in-process counters, histograms and pool gauges (no database access)"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
 # ============================================================================
 # Search Endpoints
 # ============================================================================
@@ -256,6 +327,8 @@ async def search(req: SearchRequest):
             use_cache=req.use_cache,
             similarity_threshold=req.similarity_threshold,
             scrape_content=req.scrape_content,
+            scrape_deadline=req.scrape_deadline,
+            force_refresh=req.force_refresh,
             summarize_each=req.summarize_each,
             summarize_all=req.summarize_all,
             use_llm_summary=req.use_llm_summary
@@ -337,6 +410,36 @@ async def search_deep_endpoint(req: QuickSearchRequest):
             details={"query": req.query, "error_type": type(e).__name__}
         )
 
+@app.post("/search/stream", tags=["Search"])
+@traced("stream_search")
+async def search_stream_endpoint(req: SearchRequest):
+    """
+    Streaming search - same options as /search, answered as NDJSON events
+    
+    Emits cached/live results as soon as they are known, then each scraped page,
+    each per-result summary and the aggregate summary tokens as they complete.
+    The final line is {"event": "done", ...} with the full /search response.
+    """
+    logger.info(f"Streaming search: query='{req.query}', max_results={req.max_results}")
+    events = stream_ddg_search(
+        req.query,
+        max_results=req.max_results,
+        use_cache=req.use_cache,
+        similarity_threshold=req.similarity_threshold,
+        scrape_content=req.scrape_content,
+        scrape_deadline=req.scrape_deadline,
+        force_refresh=req.force_refresh,
+        summarize_each=req.summarize_each,
+        summarize_all=req.summarize_all,
+        use_llm_summary=req.use_llm_summary
+    )
+    
+    async def ndjson():
+        async for event in events:
+            yield json.dumps(event, default=str) + "\n"
+    
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
 # ============================================================================
 # Cache Management Endpoints
 # ============================================================================
@@ -416,38 +519,26 @@ async def clear_cache_endpoint():
 @traced("batch_search")
 async def batch_search(req: BatchSearchRequest):
     """
-    Search multiple queries in parallel
+    Search multiple queries as one batch
+    
+    Duplicates are resolved once, cache hits in bulk lookups, misses as rate-limited
+    live searches saved in one bulk insert.
     
     Useful for: comparison searches, multi-topic research
     Limit: 10 queries per batch
     """
     try:
-        import asyncio
-        
         logger.info(f"Batch search: {len(req.queries)} queries, max_results={req.max_results_per_query}")
         
-        async def search_one(query: str) -> Dict[str, Any]:
-            try:
-                result = await cached_ddg_search(
-                    query=query,
-                    max_results=req.max_results_per_query,
-                    use_cache=req.use_cache,
-                    summarize_all=req.summarize,
-                    use_llm_summary=req.summarize
-                )
-                result['success'] = True
-                return result
-            except Exception as e:
-                logger.error(f"Batch search failed for '{query}': {e}")
-                return {
-                    "query": query, 
-                    "error": str(e), 
-                    "error_type": type(e).__name__,
-                    "results": [],
-                    "success": False
-                }
-        
-        results = await asyncio.gather(*[search_one(q) for q in req.queries], return_exceptions=False)
+        results = await batch_ddg_search(
+            req.queries,
+            max_results=req.max_results_per_query,
+            use_cache=req.use_cache,
+            summarize_all=req.summarize,
+            use_llm_summary=req.summarize
+        )
+        for result in results:
+            result['success'] = result.get('source') != 'error'
         
         successful = sum(1 for r in results if r.get('success', False))
         failed = len(results) - successful
@@ -17,13 +17,12 @@ from datetime import datetime
 from typing import List, Dict, Optional, Tuple
 
 from ddg_cache import (
-    init_database, get_cache_stats, clear_cache,
-    get_session, CacheEntry, hash_query,
-    search_duckduckgo, scrape_url, summarize_text, summarize_with_llm,
+    init_database, get_cache_stats, clear_cache, dispose_engines, warm_up_embedder,
+    list_cache_entries, list_cache_results, get_entry, get_entry_result,
+    update_entry_result, delete_entry_result, replace_entry, delete_cache_entry,
+    search_duckduckgo, get_page_text, summarize_text, get_llm_summary,
     get_cached_result, save_to_cache
 )
-from sqlalchemy import select, desc, func
-from sqlalchemy.orm.attributes import flag_modified
 
 sys.path.append('/dli/task/composer/microservices')
 from observability import get_observability
@@ -68,56 +67,73 @@ def format_timestamp(dt: datetime) -> str:
     """Format datetime for display"""
     return dt.strftime("%Y-%m-%d %H:%M:%S")
 
-def parse_table_click(evt: gr.SelectData, df: pd.DataFrame) -> str:
-    """Extract ID from clicked row in dataframe"""
-    if evt.index is not None and len(evt.index) >= 1:
-        row_idx = evt.index[0]
-        if not df.empty and row_idx < len(df):
-            return str(df.iloc[row_idx, 0])
-    return ""
-
-def parse_chunk_table_click(evt: gr.SelectData, df: pd.DataFrame) -> Tuple[str, int]:
-    """Extract Entry ID and Result Index from clicked chunk row"""
-    if evt.index is not None and len(evt.index) >= 1:
-        row_idx = evt.index[0]
-        if not df.empty and row_idx < len(df):
-            entry_id = str(df.iloc[row_idx, 0])
-            result_idx = int(df.iloc[row_idx, 2])
-            return entry_id, result_idx
-    return "", 0
+def page_row_key(evt: gr.SelectData, page: Optional[Dict]):
+    """Key of the clicked row, resolved from the page state (no table reload)"""
+    if page and evt.index is not None and len(evt.index) >= 1 and evt.index[0] < len(page["keys"]):
+        return page["keys"][evt.index[0]]
+    return None
+
+# ============================================================================
+# Cache Browser Paging
+# ============================================================================
+
+AGG_PAGE_SIZE = 50      # entries per page
+CHUNK_PAGE_SIZE = 20    # entries per page (all their results shown)
+SORT_CHOICES = {"Last access": "last_accessed", "Created": "created_at",
+                "Access count": "access_count", "Query": "query"}
+
+def new_page(filter_text: str = "", sort_label: str = "Last access", descending: bool = True) -> Dict:
+    """
+    Browser page state (kept in gr.State): listing options, the start cursor of every page
+    visited so far (for Previous), the next page's cursor and the keys of the rows shown.
+    """
+    return {"text": filter_text or "", "sort": SORT_CHOICES.get(sort_label, "last_accessed"),
+            "descending": bool(descending), "starts": [None], "next": None, "keys": []}
+
+def turn_page(page: Optional[Dict], move: int = 0) -> Dict:
+    """Page state for the previous (-1), current (0) or next (+1) page"""
+    if page is None: return new_page()
+    starts = list(page["starts"])
+    if move > 0 and page["next"] is not None: starts.append(page["next"])
+    elif move < 0 and len(starts) > 1: starts.pop()
+    return {**page, "starts": starts, "next": None, "keys": []}
+
+def page_label(page: Dict, rows: int, noun: str) -> str:
+    more = "more on next page" if page["next"] is not None else "last page"
+    return f"Page {len(page['starts'])} · {rows} {noun} · {more}"
 
 # ============================================================================
 # Cache Operations - Aggregated View
 # ============================================================================
 
-async def load_cache_table(limit: int = 100) -> pd.DataFrame:
-    """Load aggregated cache entries"""
+async def load_cache_table(page: Optional[Dict] = None, move: int = 0) -> Tuple[pd.DataFrame, Dict, str]:
+    """Load one page of aggregated cache entries; returns (table, page state, page label)"""
+    page = turn_page(page, move)
     try:
-        async with get_session() as session:
-            result = await session.execute(
-                select(CacheEntry).order_by(desc(CacheEntry.last_accessed)).limit(limit)
-            )
-            entries = result.scalars().all()
-            
-            if not entries:
-                return pd.DataFrame(columns=["Entry ID", "Query", "Results", "Has Summary", "Created", "Last Access", "Access Count"])
-            
-            data = []
-            for e in entries:
-                data.append({
-                    "Entry ID": e.query_hash[:12],
-                    "Query": truncate_text(e.query_text, 80),
-                    "Results": len(e.results) if e.results else 0,
-                    "Has Summary": "Yes" if e.summary else "No",
-                    "Created": format_timestamp(e.created_at),
-                    "Last Access": format_timestamp(e.last_accessed),
-                    "Access Count": e.access_count
-                })
-            
-            return pd.DataFrame(data)
+        entries, page["next"] = await list_cache_entries(
+            AGG_PAGE_SIZE, page["starts"][-1], page["text"], page["sort"], page["descending"])
+        page["keys"] = [e["query_hash"] for e in entries]
+        
+        if not entries:
+            return (pd.DataFrame(columns=["Entry ID", "Query", "Results", "Has Summary", "Created", "Last Access", "Access Count"]),
+                    page, "No cache entries found")
+        
+        data = []
+        for e in entries:
+            data.append({
+                "Entry ID": e["query_hash"][:12],
+                "Query": truncate_text(e["query_text"], 80),
+                "Results": e["result_count"] or 0,
+                "Has Summary": "Yes" if e["has_summary"] else "No",
+                "Created": format_timestamp(e["created_at"]),
+                "Last Access": format_timestamp(e["last_accessed"]),
+                "Access Count": e["access_count"]
+            })
+        
+        return pd.DataFrame(data), page, page_label(page, len(data), "entries")
     except Exception as e:
         logger.error(f"Failed to load cache: {e}")
-        return pd.DataFrame()
+        return pd.DataFrame(), page, f"Error: {str(e)}"
 
 async def get_cache_stats_text() -> str:
     """Get formatted cache statistics"""
@@ -135,142 +151,97 @@ async def get_cache_stats_text() -> str:
 # Cache Operations - Chunk/Result Level View
 # ============================================================================
 
-async def load_chunk_cache_table(query_id: str = "") -> Tuple[pd.DataFrame, str]:
-    """Load individual results/chunks from cache entries"""
+async def load_chunk_cache_table(page: Optional[Dict] = None, move: int = 0) -> Tuple[pd.DataFrame, Dict, str]:
+    """Load the individual results/chunks of one page of cache entries; returns (table, page state, status)"""
+    page = turn_page(page, move)
     try:
-        async with get_session() as session:
-            if query_id.strip():
-                result = await session.execute(
-                    select(CacheEntry).where(CacheEntry.query_hash.like(f"{query_id.strip()}%"))
-                )
-                entries = [result.scalars().first()]
-                if not entries[0]:
-                    return pd.DataFrame(), f"Entry with ID '{query_id}' not found"
-            else:
-                result = await session.execute(
-                    select(CacheEntry).order_by(desc(CacheEntry.last_accessed)).limit(50)
-                )
-                entries = result.scalars().all()
-            
-            if not entries or not any(entries):
-                return pd.DataFrame(columns=["Entry ID", "Query", "Result Index", "Title", "URL", "Has Content", "Has Summary"]), "No cache entries found"
-            
-            data = []
-            for entry in entries:
-                if not entry or not entry.results:
-                    continue
-                    
-                for idx, result_item in enumerate(entry.results):
-                    data.append({
-                        "Entry ID": entry.query_hash[:12],
-                        "Query": truncate_text(entry.query_text, 60),
-                        "Result Index": idx,
-                        "Title": truncate_text(result_item.get('title', 'N/A'), 60),
-                        "URL": truncate_text(result_item.get('href', 'N/A'), 50),
-                        "Has Content": "Yes" if result_item.get('scraped_content') else "No",
-                        "Has Summary": "Yes" if result_item.get('summary') else "No"
-                    })
-            
-            return pd.DataFrame(data), f"Loaded {len(data)} individual results from {len([e for e in entries if e])} cache entries"
+        rows, page["next"] = await list_cache_results(
+            CHUNK_PAGE_SIZE, page["starts"][-1], page["text"], page["sort"], page["descending"])
+        page["keys"] = [(row["query_hash"], row["result_index"]) for row in rows]
+        
+        if not rows:
+            if page["text"].strip():
+                return pd.DataFrame(), page, f"No entries match '{page['text']}'"
+            return pd.DataFrame(columns=["Entry ID", "Query", "Result Index", "Title", "URL", "Has Content", "Has Summary"]), page, "No cache entries found"
+        
+        data = []
+        for row in rows:
+            data.append({
+                "Entry ID": row["query_hash"][:12],
+                "Query": truncate_text(row["query_text"], 60),
+                "Result Index": row["result_index"],
+                "Title": truncate_text(row["title"] or 'N/A', 60),
+                "URL": truncate_text(row["href"] or 'N/A', 50),
+                "Has Content": "Yes" if row["has_content"] else "No",
+                "Has Summary": "Yes" if row["has_summary"] else "No"
+            })
+        
+        entry_count = len({row["query_hash"] for row in rows})
+        return pd.DataFrame(data), page, page_label(page, len(data), f"results from {entry_count} cache entries")
     except Exception as e:
         logger.error(f"Failed to load chunk cache: {e}")
-        return pd.DataFrame(), f"Error: {str(e)}"
+        return pd.DataFrame(), page, f"Error: {str(e)}"
 
 async def get_chunk_details(entry_id: str, result_index: int) -> Tuple[str, str, str, str, str, str]:
     """Get details of a specific chunk/result for editing"""
     try:
-        async with get_session() as session:
-            result = await session.execute(
-                select(CacheEntry).where(CacheEntry.query_hash.like(f"{entry_id.strip()}%"))
-            )
-            entry = result.scalars().first()
-            
-            if not entry:
-                return ("", "", "", "", "", f"Entry '{entry_id}' not found")
-            
-            if not entry.results or result_index >= len(entry.results):
-                return ("", "", "", "", "", f"Result #{result_index} not found in entry")
-            
-            chunk = entry.results[result_index]
-            
-            info = f"""**Entry ID:** {entry.query_hash[:16]}...  
-**Query:** {entry.query_text}  
+        chunk = await get_entry_result(entry_id, int(result_index))
+        
+        if not chunk:
+            return ("", "", "", "", "", f"Result #{result_index} not found in entry '{entry_id}'")
+        
+        info = f"""**Entry ID:** {chunk['query_hash'][:16]}...  
+**Query:** {chunk['query_text']}  
 **Result Index:** {result_index}  
-**Created:** {format_timestamp(entry.created_at)}"""
-            
-            title = chunk.get('title', '')
-            url = chunk.get('href', '')
-            scraped_content = chunk.get('scraped_content', '')
-            summary = chunk.get('summary', '')
-            
-            return (info, title, url, scraped_content, summary, "")
+**Created:** {format_timestamp(chunk['created_at'])}"""
+        
+        title = chunk.get('title', '')
+        url = chunk.get('href', '')
+        scraped_content = chunk.get('scraped_content', '')
+        summary = chunk.get('summary', '')
+        
+        return (info, title, url, scraped_content, summary, "")
     except Exception as e:
         logger.error(f"Failed to get chunk details: {e}")
         return ("", "", "", "", "", f"Error: {str(e)}")
 
-async def update_chunk(entry_id: str, result_index: int, title: str, url: str, 
-                       scraped_content: str, summary: str) -> Tuple[str, pd.DataFrame]:
+async def update_chunk(entry_id: str, result_index: int, title: str, url: str, scraped_content: str,
+                       summary: str, page: Optional[Dict] = None) -> Tuple[str, pd.DataFrame, Dict]:
     """Update a specific chunk/result in cache"""
     try:
-        async with get_session() as session:
-            result = await session.execute(
-                select(CacheEntry).where(CacheEntry.query_hash.like(f"{entry_id.strip()}%"))
-            )
-            entry = result.scalars().first()
-            
-            if not entry:
-                return (f"Entry '{entry_id}' not found", pd.DataFrame())
-            
-            if not entry.results or result_index >= len(entry.results):
-                return (f"Result #{result_index} not found", pd.DataFrame())
-            
-            entry.results[result_index]['title'] = title
-            entry.results[result_index]['href'] = url
-            if scraped_content.strip():
-                entry.results[result_index]['scraped_content'] = scraped_content
-            if summary.strip():
-                entry.results[result_index]['summary'] = summary
-            
-            flag_modified(entry, "results")
-            await session.commit()
-            
-            new_table, _ = await load_chunk_cache_table()
-            return (f"Successfully updated result #{result_index} in entry {entry_id[:12]}", new_table)
+        fields = {"title": title, "href": url}
+        if scraped_content.strip():
+            fields["scraped_content"] = scraped_content
+        if summary.strip():
+            fields["summary"] = summary
+        
+        if not await update_entry_result(entry_id, int(result_index), **fields):
+            return (f"Result #{result_index} not found in entry '{entry_id}'", gr.update(), page)
+        
+        new_table, page, _ = await load_chunk_cache_table(page)
+        return (f"Successfully updated result #{result_index} in entry {entry_id[:12]}", new_table, page)
     except Exception as e:
         logger.error(f"Failed to update chunk: {e}")
-        return (f"Error: {str(e)}", pd.DataFrame())
+        return (f"Error: {str(e)}", gr.update(), page)
 
-async def delete_chunk(entry_id: str, result_index: int) -> Tuple[str, pd.DataFrame]:
+async def delete_chunk(entry_id: str, result_index: int, page: Optional[Dict] = None) -> Tuple[str, pd.DataFrame, Dict]:
     """Delete a specific chunk/result from cache entry"""
     try:
-        async with get_session() as session:
-            result = await session.execute(
-                select(CacheEntry).where(CacheEntry.query_hash.like(f"{entry_id.strip()}%"))
-            )
-            entry = result.scalars().first()
-            
-            if not entry:
-                return (f"Entry '{entry_id}' not found", pd.DataFrame())
-            
-            if not entry.results or result_index >= len(entry.results):
-                return (f"Result #{result_index} not found", pd.DataFrame())
-            
-            del entry.results[result_index]
-            
-            if not entry.results:
-                await session.delete(entry)
-                msg = f"Deleted result #{result_index} and removed empty entry {entry_id[:12]}"
-            else:
-                flag_modified(entry, "results")
-                msg = f"Deleted result #{result_index} from entry {entry_id[:12]}"
-            
-            await session.commit()
-            
-            new_table, _ = await load_chunk_cache_table()
-            return (msg, new_table)
+        removed_entry = await delete_entry_result(entry_id, int(result_index))
+        
+        if removed_entry is None:
+            return (f"Result #{result_index} not found in entry '{entry_id}'", gr.update(), page)
+        
+        if removed_entry:
+            msg = f"Deleted result #{result_index} and removed empty entry {entry_id[:12]}"
+        else:
+            msg = f"Deleted result #{result_index} from entry {entry_id[:12]}"
+        
+        new_table, page, _ = await load_chunk_cache_table(page)
+        return (msg, new_table, page)
     except Exception as e:
         logger.error(f"Failed to delete chunk: {e}")
-        return (f"Error: {str(e)}", pd.DataFrame())
+        return (f"Error: {str(e)}", gr.update(), page)
 
 # ============================================================================
 # Aggregated Entry Operations
@@ -279,93 +250,70 @@ async def delete_chunk(entry_id: str, result_index: int) -> Tuple[str, pd.DataFr
 async def get_entry_details(entry_id: str) -> Tuple[str, str, str, str]:
     """Get full aggregated entry details for editing"""
     try:
-        async with get_session() as session:
-            result = await session.execute(
-                select(CacheEntry).where(CacheEntry.query_hash.like(f"{entry_id.strip()}%"))
-            )
-            entry = result.scalars().first()
-            
-            if not entry:
-                return ("", "", "", f"Entry '{entry_id}' not found")
-            
-            info = f"""**Query Hash:** {entry.query_hash[:16]}...  
-**Query Text:** {entry.query_text}  
-**Results Count:** {len(entry.results) if entry.results else 0}  
-**Created:** {format_timestamp(entry.created_at)}  
-**Last Accessed:** {format_timestamp(entry.last_accessed)}  
-**Access Count:** {entry.access_count}"""
-            
-            results_json = json.dumps(entry.results, indent=2) if entry.results else "[]"
-            summary_text = entry.summary or ""
-            
-            return (info, results_json, summary_text, "")
+        entry = await get_entry(entry_id)
+        
+        if not entry:
+            return ("", "", "", f"Entry '{entry_id}' not found")
+        
+        info = f"""**Query Hash:** {entry['query_hash'][:16]}...  
+**Query Text:** {entry['query_text']}  
+**Results Count:** {len(entry['results'])}  
+**Created:** {format_timestamp(entry['created_at'])}  
+**Last Accessed:** {format_timestamp(entry['last_accessed'])}  
+**Access Count:** {entry['access_count']}"""
+        
+        results_json = json.dumps(entry['results'], indent=2) if entry['results'] else "[]"
+        summary_text = entry['summary'] or ""
+        
+        return (info, results_json, summary_text, "")
     except Exception as e:
         logger.error(f"Failed to get entry details: {e}")
         return ("", "", "", f"Error: {str(e)}")
 
-async def update_entry(entry_id: str, results_json: str, summary: str) -> Tuple[str, pd.DataFrame]:
+async def update_entry(entry_id: str, results_json: str, summary: str,
+                       page: Optional[Dict] = None) -> Tuple[str, pd.DataFrame, Dict]:
     """Update aggregated entry (all results + summary)"""
     try:
-        async with get_session() as session:
-            result = await session.execute(
-                select(CacheEntry).where(CacheEntry.query_hash.like(f"{entry_id.strip()}%"))
-            )
-            entry = result.scalars().first()
-            
-            if not entry:
-                return (f"Entry '{entry_id}' not found", pd.DataFrame())
-            
-            if results_json.strip():
-                try:
-                    new_results = json.loads(results_json)
-                    if not isinstance(new_results, list):
-                        return ("Results must be a JSON array", pd.DataFrame())
-                    entry.results = new_results
-                except json.JSONDecodeError as e:
-                    return (f"Invalid JSON: {str(e)}", pd.DataFrame())
-            
-            if summary.strip():
-                entry.summary = summary
-            
-            await session.commit()
-            
-            new_table = await load_cache_table()
-            return (f"Successfully updated entry {entry_id[:12]}", new_table)
+        new_results = None
+        if results_json.strip():
+            try:
+                new_results = json.loads(results_json)
+                if not isinstance(new_results, list):
+                    return ("Results must be a JSON array", gr.update(), page)
+            except json.JSONDecodeError as e:
+                return (f"Invalid JSON: {str(e)}", gr.update(), page)
+        
+        if not await replace_entry(entry_id, new_results, summary if summary.strip() else None):
+            return (f"Entry '{entry_id}' not found", gr.update(), page)
+        
+        new_table, page, _ = await load_cache_table(page)
+        return (f"Successfully updated entry {entry_id[:12]}", new_table, page)
     except Exception as e:
         logger.error(f"Failed to update entry: {e}")
-        return (f"Error: {str(e)}", pd.DataFrame())
+        return (f"Error: {str(e)}", gr.update(), page)
 
-async def delete_entry(entry_id: str) -> Tuple[str, pd.DataFrame]:
+async def delete_entry(entry_id: str, page: Optional[Dict] = None) -> Tuple[str, pd.DataFrame, Dict]:
     """Delete entire cache entry"""
     try:
-        async with get_session() as session:
-            result = await session.execute(
-                select(CacheEntry).where(CacheEntry.query_hash.like(f"{entry_id.strip()}%"))
-            )
-            entry = result.scalars().first()
-            
-            if not entry:
-                return (f"Entry '{entry_id}' not found", pd.DataFrame())
-            
-            await session.delete(entry)
-            await session.commit()
-            
-            new_table = await load_cache_table()
-            return (f"Deleted entry {entry_id[:12]}", new_table)
+        if not await delete_cache_entry(entry_id):
+            return (f"Entry '{entry_id}' not found", gr.update(), page)
+        
+        new_table, page, _ = await load_cache_table(page)
+        return (f"Deleted entry {entry_id[:12]}", new_table, page)
     except Exception as e:
         logger.error(f"Failed to delete entry: {e}")
-        return (f"Error: {str(e)}", pd.DataFrame())
+        return (f"Error: {str(e)}", gr.update(), page)
 
-async def clear_all_cache() -> Tuple[str, str, pd.DataFrame]:
+async def clear_all_cache(page: Optional[Dict] = None) -> Tuple[str, str, pd.DataFrame, Dict, str]:
     """Clear entire cache"""
     try:
         count = await clear_cache()
         stats = await get_cache_stats_text()
-        table = await load_cache_table()
-        return (f"Cleared {count} cache entries", stats, table)
+        table, page, label = await load_cache_table(new_page())
+        return (f"Cleared {count} cache entries", stats, table, page, label)
     except Exception as e:
         logger.error(f"Failed to clear cache: {e}")
-        return (f"Error: {str(e)}", "", pd.DataFrame())
+        return (f"Error: {str(e)}", "", gr.update(), page, "")
 
 # ============================================================================
 # Search Operations
@@ -487,7 +435,7 @@ async def execute_search(
                         return result
                     progress(0.5 + 0.2 * (idx / len(results)), desc=f"Scraping URL {idx+1}/{len(results)}...")
                     try:
-                        content = await scrape_url(url)
+                        content = await get_page_text(url)
                         if content:
                             result["scraped_content"] = content
                             scraped_count += 1
@@ -516,7 +464,7 @@ async def execute_search(
                         return result
                     try:
                         if use_llm:
-                            llm_sum = await summarize_with_llm(text)
+                            llm_sum = await get_llm_summary(text)
                             result["summary"] = llm_sum or summarize_text(text)
                         else:
                             result["summary"] = summarize_text(text)
@@ -539,7 +487,7 @@ async def execute_search(
             all_text = "Original Query: " + query + "\n\n" + "\n\n".join(result_strs)
             try:
                 if use_llm:
-                    overall_summary = await summarize_with_llm(all_text)
+                    overall_summary = await get_llm_summary(all_text)
                     if not overall_summary:
                         overall_summary = summarize_text(all_text, max_length=1000)
                 else:
@@ -714,12 +662,28 @@ def create_app():
                 clear_all_btn = gr.Button("Clear All Cache", variant="stop", scale=1)
             
             cache_stats_md = gr.Markdown()
+            
+            with gr.Row():
+                agg_filter = gr.Textbox(
+                    label="Filter (query text or Entry ID prefix, Enter to apply)",
+                    placeholder="Leave empty to show all entries",
+                    scale=3
+                )
+                agg_sort = gr.Dropdown(list(SORT_CHOICES), value="Last access", label="Sort by", scale=1)
+                agg_descending = gr.Checkbox(value=True, label="Descending", scale=1)
+            
+            agg_page = gr.State(new_page())
             cache_table = gr.Dataframe(
                 wrap=True,
                 interactive=False,
                 column_widths=["10%", "30%", "8%", "10%", "15%", "15%", "12%"]
             )
             
+            with gr.Row():
+                agg_prev_btn = gr.Button("← Previous", scale=1)
+                agg_page_md = gr.Markdown()
+                agg_next_btn = gr.Button("Next →", scale=1)
+            
             gr.Markdown("---")
             gr.Markdown("### Edit Cache Entry")
             
@@ -758,19 +722,32 @@ def create_app():
             agg_status_md = gr.Markdown()
             
             # Wire up aggregated cache
-            async def refresh_agg():
+            async def refresh_agg(page):
                 stats = await get_cache_stats_text()
-                table = await load_cache_table()
-                return (stats, table)
+                table, page, label = await load_cache_table(page)
+                return (stats, table, page, label)
+            
+            async def filter_agg(filter_text, sort_label, descending):
+                return await load_cache_table(new_page(filter_text, sort_label, descending))
             
-            refresh_agg_btn.click(refresh_agg, outputs=[cache_stats_md, cache_table])
-            clear_all_btn.click(clear_all_cache, outputs=[agg_status_md, cache_stats_md, cache_table])
+            async def prev_agg(page):
+                return await load_cache_table(page, -1)
             
-            # Auto-load on row click
-            async def on_agg_row_click(evt: gr.SelectData):
+            async def next_agg(page):
+                return await load_cache_table(page, 1)
+            
+            agg_page_outputs = [cache_table, agg_page, agg_page_md]
+            refresh_agg_btn.click(refresh_agg, inputs=[agg_page], outputs=[cache_stats_md, *agg_page_outputs])
+            clear_all_btn.click(clear_all_cache, inputs=[agg_page], outputs=[agg_status_md, cache_stats_md, *agg_page_outputs])
+            for control in (agg_filter.submit, agg_sort.change, agg_descending.change):
+                control(filter_agg, inputs=[agg_filter, agg_sort, agg_descending], outputs=agg_page_outputs)
+            agg_prev_btn.click(prev_agg, inputs=[agg_page], outputs=agg_page_outputs)
+            agg_next_btn.click(next_agg, inputs=[agg_page], outputs=agg_page_outputs)
+            
+            # Auto-load on row click (the row's entry comes from the page state, no reload)
+            async def on_agg_row_click(page, evt: gr.SelectData):
                 try:
-                    current_df = await load_cache_table()
-                    entry_id = parse_table_click(evt, current_df)
+                    entry_id = page_row_key(evt, page)
                     
                     if entry_id:
                         info, results, summary, status = await get_entry_details(entry_id)
@@ -783,6 +760,7 @@ def create_app():
             
             cache_table.select(
                 on_agg_row_click,
+                inputs=[agg_page],
                 outputs=[agg_entry_id, agg_entry_info, agg_results_editor, agg_summary_editor, agg_status_md]
             )
             
@@ -794,14 +772,14 @@ def create_app():
             
             save_agg_btn.click(
                 update_entry,
-                inputs=[agg_entry_id, agg_results_editor, agg_summary_editor],
-                outputs=[agg_status_md, cache_table]
+                inputs=[agg_entry_id, agg_results_editor, agg_summary_editor, agg_page],
+                outputs=[agg_status_md, cache_table, agg_page]
             )
             
             delete_agg_btn.click(
                 delete_entry,
-                inputs=[agg_entry_id],
-                outputs=[agg_status_md, cache_table]
+                inputs=[agg_entry_id, agg_page],
+                outputs=[agg_status_md, cache_table, agg_page]
             )
         
         # ====================================================================
@@ -813,17 +791,20 @@ def create_app():
             gr.Markdown("""
             **Instructions:** Click any row in the table to automatically load that specific result for editing.
             You can edit the title, URL, content, or summary for individual search results.
-            Filter by Entry ID to see results from a specific cache entry.
+            Filter by Entry ID or query text to see results from specific cache entries.
             """)
             
             with gr.Row():
                 chunk_filter_id = gr.Textbox(
-                    label="Filter by Entry ID (optional)",
+                    label="Filter (query text or Entry ID prefix, Enter to apply)",
                     placeholder="Leave empty to show all results",
                     scale=3
                 )
+                chunk_sort = gr.Dropdown(list(SORT_CHOICES), value="Last access", label="Sort by", scale=1)
+                chunk_descending = gr.Checkbox(value=True, label="Descending", scale=1)
                 refresh_chunk_btn = gr.Button("Refresh", scale=1)
             
+            chunk_page = gr.State(new_page())
             chunk_status_md = gr.Markdown()
             chunk_table = gr.Dataframe(
                 wrap=True,
@@ -831,6 +812,10 @@ def create_app():
                 column_widths=["12%", "23%", "7%", "23%", "20%", "8%", "7%"]
             )
             
+            with gr.Row():
+                chunk_prev_btn = gr.Button("← Previous", scale=1)
+                chunk_next_btn = gr.Button("Next →", scale=1)
+            
             gr.Markdown("---")
             gr.Markdown("### Edit Individual Result")
             
@@ -891,21 +876,32 @@ def create_app():
             chunk_edit_status_md = gr.Markdown()
             
             # Wire up chunk cache
-            async def refresh_chunks(filter_id=""):
-                table, status = await load_chunk_cache_table(filter_id)
-                return (status, table)
-            
-            refresh_chunk_btn.click(
-                refresh_chunks,
-                inputs=[chunk_filter_id],
-                outputs=[chunk_status_md, chunk_table]
-            )
-            
-            # Auto-load on row click
-            async def on_chunk_row_click(evt: gr.SelectData):
+            async def refresh_chunks(page):
+                table, page, status = await load_chunk_cache_table(page)
+                return (status, table, page)
+            
+            async def filter_chunks(filter_text, sort_label, descending):
+                return await refresh_chunks(new_page(filter_text, sort_label, descending))
+            
+            async def prev_chunks(page):
+                table, page, status = await load_chunk_cache_table(page, -1)
+                return (status, table, page)
+            
+            async def next_chunks(page):
+                table, page, status = await load_chunk_cache_table(page, 1)
+                return (status, table, page)
+            
+            chunk_page_outputs = [chunk_status_md, chunk_table, chunk_page]
+            refresh_chunk_btn.click(refresh_chunks, inputs=[chunk_page], outputs=chunk_page_outputs)
+            for control in (chunk_filter_id.submit, chunk_sort.change, chunk_descending.change):
+                control(filter_chunks, inputs=[chunk_filter_id, chunk_sort, chunk_descending], outputs=chunk_page_outputs)
+            chunk_prev_btn.click(prev_chunks, inputs=[chunk_page], outputs=chunk_page_outputs)
+            chunk_next_btn.click(next_chunks, inputs=[chunk_page], outputs=chunk_page_outputs)
+            
+            # Auto-load on row click (entry and result index come from the page state, no reload)
+            async def on_chunk_row_click(page, evt: gr.SelectData):
                 try:
-                    current_df, _ = await load_chunk_cache_table(chunk_filter_id.value or "")
-                    entry_id, result_idx = parse_chunk_table_click(evt, current_df)
+                    entry_id, result_idx = page_row_key(evt, page) or ("", 0)
                     
                     if entry_id:
                         info, title, url, content, summary, status = await get_chunk_details(entry_id, result_idx)
@@ -918,6 +914,7 @@ def create_app():
             
             chunk_table.select(
                 on_chunk_row_click,
+                inputs=[chunk_page],
                 outputs=[chunk_entry_id, chunk_result_idx, chunk_info_md, chunk_title, 
                         chunk_url, chunk_content, chunk_summary, chunk_edit_status_md]
             )
@@ -930,18 +927,18 @@ def create_app():
             
             save_chunk_btn.click(
                 update_chunk,
-                inputs=[chunk_entry_id, chunk_result_idx, chunk_title, chunk_url, chunk_content, chunk_summary],
-                outputs=[chunk_edit_status_md, chunk_table]
+                inputs=[chunk_entry_id, chunk_result_idx, chunk_title, chunk_url, chunk_content, chunk_summary, chunk_page],
+                outputs=[chunk_edit_status_md, chunk_table, chunk_page]
             )
             
             delete_chunk_btn.click(
                 delete_chunk,
-                inputs=[chunk_entry_id, chunk_result_idx],
-                outputs=[chunk_edit_status_md, chunk_table]
+                inputs=[chunk_entry_id, chunk_result_idx, chunk_page],
+                outputs=[chunk_edit_status_md, chunk_table, chunk_page]
             )
 
-            agg_tab.select(refresh_agg, outputs=[cache_stats_md, cache_table])
-            chunk_tab.select(refresh_chunks, inputs=[chunk_filter_id], outputs=[chunk_status_md, chunk_table])
+            agg_tab.select(refresh_agg, inputs=[agg_page], outputs=[cache_stats_md, *agg_page_outputs])
+            chunk_tab.select(refresh_chunks, inputs=[chunk_page], outputs=chunk_page_outputs)
         
         # ====================================================================
         # API Documentation Tab
@@ -982,7 +979,14 @@ def create_app():
               -H "Content-Type: application/json" \\
               -d '{"query": "AI trends", "max_results": 10}'
             ```
-            
+
+            **POST /search/stream** - Same options as /search, streamed as NDJSON events
+            ```bash
+            curl -N -X POST http://localhost:7861/search/stream \\
+              -H "Content-Type: application/json" \\
+              -d '{"query": "AI trends", "scrape_content": true, "summarize_all": true, "use_llm_summary": true}'
+            ```
+
             **POST /search/batch** - Search multiple queries
             ```bash
             curl -X POST http://localhost:7861/search/batch \\
@@ -1002,6 +1006,8 @@ def create_app():
             
             **GET /stats** - Get cache statistics
             
+            **GET /stats/runtime** - Worker pool queue depth/wait times, embedder and index stats
+            
             **GET /health** - Health check
             
             ### Interactive Documentation
@@ -1073,13 +1079,13 @@ def create_app():
         # Load initial data on startup
         async def load_initial_data():
             stats = await get_cache_stats_text()
-            agg_table = await load_cache_table()
-            chunk_table, chunk_msg = await load_chunk_cache_table()
-            return (stats, agg_table, chunk_msg, chunk_table)
+            agg_table, agg_state, agg_label = await load_cache_table()
+            chunk_table, chunk_state, chunk_msg = await load_chunk_cache_table()
+            return (stats, agg_table, agg_state, agg_label, chunk_msg, chunk_table, chunk_state)
         
         demo.load(
             load_initial_data,
-            outputs=[cache_stats_md, cache_table, chunk_status_md, chunk_table]
+            outputs=[cache_stats_md, cache_table, agg_page, agg_page_md, chunk_status_md, chunk_table, chunk_page]
         )
     
     return demo
@@ -1095,10 +1101,15 @@ async def startup():
         await init_database()
         stats = await get_cache_stats()
         logger.info(f"Database ready: {stats['total_queries']} cached queries")
+        if not await warm_up_embedder():
+            logger.warning("Embedding model unavailable - semantic cache disabled")
         return True
     except Exception as e:
         logger.error(f"Initialization failed: {e}", exc_info=True)
         raise
+    finally:
+        # Gradio serves on a different event loop; don't carry pooled connections over
+        await dispose_engines()
 
 if __name__ == "__main__":
     # Initialize database
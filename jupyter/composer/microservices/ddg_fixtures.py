@@ -0,0 +1,167 @@
+"""
+ddg_fixtures.py - Offline search backend for tests, benchmarks and demos
+
+Serves canned results and pages from a fixtures directory:
+    <root>/results/<hash_query(query)>.json    [{title, body, href}, ...]
+    <root>/pages/<hash_url(url)>.html
+Queries and URLs without a fixture get deterministic synthetic content (same input, same output)
+unless synthesize=False, in which case search returns [] and fetch fails with a 404.
+
+Usage:
+    from ddg_cache import set_search_backend
+    from ddg_fixtures import LocalFixtureBackend
+    set_search_backend(LocalFixtureBackend("fixtures", search_latency=0.2, throttle_rate=0.05))
+
+ddg_api.py installs it when DDG_SEARCH_BACKEND=fixtures (configured from DDG_FIXTURES_* env vars).
+Searches still pass through the search gateway; DDG_SEARCH_RATE=0 lifts its rate limit for load tests.
+"""
+import asyncio, json, os, random
+from typing import Dict, List, Optional
+
+import httpx
+
+from ddg_cache import (SearchBackend, ScrapedPage, SearchError, SearchThrottled, _env_bool, _env_float,
+                       _env_int, _extract_text, get_executor, hash_content, hash_query, hash_url)
+
+_WORDS = ("cache", "vector", "latency", "index", "query", "embedding", "throughput", "replica", "shard",
+          "pipeline", "summary", "token", "model", "cluster", "request", "memory", "batch", "kernel",
+          "search", "result", "page", "network", "storage", "benchmark", "scheduler", "stream")
+
+class LocalFixtureBackend(SearchBackend):
+    """
+    Deterministic stand-in for DuckDuckGo and the web.
+
+    - search_latency / fetch_latency (seconds) plus up to `jitter` of uniform noise per call
+    - throttle_rate / timeout_rate / failure_rate inject SearchThrottled, asyncio.TimeoutError and
+      SearchError into searches (exercising the gateway's retries and circuit breaker);
+      fetch_failure_rate does the same for page fetches
+    - All randomness comes from `seed`, so a run with the same call order replays exactly
+    """
+    name = "fixtures"
+
+    def __init__(self, root: str = "fixtures", *, search_latency: float = 0.0, fetch_latency: float = 0.0,
+                 jitter: float = 0.0, throttle_rate: float = 0.0, timeout_rate: float = 0.0,
+                 failure_rate: float = 0.0, fetch_failure_rate: float = 0.0, seed: int = 0,
+                 synthesize: bool = True, page_paragraphs: int = 8):
+        self.root, self.synthesize, self.page_paragraphs = root, synthesize, page_paragraphs
+        self.search_latency, self.fetch_latency, self.jitter = search_latency, fetch_latency, jitter
+        self.throttle_rate, self.timeout_rate, self.failure_rate = throttle_rate, timeout_rate, failure_rate
+        self.fetch_failure_rate = fetch_failure_rate
+        self._faults, self._latency = random.Random(seed), random.Random(seed + 1)
+        self.stats = {"searches": 0, "fetches": 0, "fixture_hits": 0, "synthesized": 0,
+                      "injected_throttles": 0, "injected_timeouts": 0, "injected_failures": 0}
+
+    @classmethod
+    def from_env(cls) -> "LocalFixtureBackend":
+        return cls(os.getenv("DDG_FIXTURES_DIR", "fixtures"),
+                   search_latency=_env_float("DDG_FIXTURES_SEARCH_LATENCY", 0.0),
+                   fetch_latency=_env_float("DDG_FIXTURES_FETCH_LATENCY", 0.0),
+                   jitter=_env_float("DDG_FIXTURES_JITTER", 0.0),
+                   throttle_rate=_env_float("DDG_FIXTURES_THROTTLE_RATE", 0.0),
+                   timeout_rate=_env_float("DDG_FIXTURES_TIMEOUT_RATE", 0.0),
+                   failure_rate=_env_float("DDG_FIXTURES_FAILURE_RATE", 0.0),
+                   fetch_failure_rate=_env_float("DDG_FIXTURES_FETCH_FAILURE_RATE", 0.0),
+                   seed=_env_int("DDG_FIXTURES_SEED", 0),
+                   synthesize=_env_bool("DDG_FIXTURES_SYNTHESIZE", True),
+                   page_paragraphs=_env_int("DDG_FIXTURES_PAGE_PARAGRAPHS", 8))
+
+    # ------------------------------------------------------------------ fixtures on disk
+
+    def _path(self, kind: str, key: str, ext: str) -> str:
+        return os.path.join(self.root, kind, f"{key}.{ext}")
+
+    def _read(self, path: str) -> Optional[str]:
+        try:
+            with open(path, encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _write(self, path: str, content: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+
+    def save_results(self, query: str, results: List[Dict]):
+        """Record canned results for query (e.g. captured from a live run)"""
+        self._write(self._path("results", hash_query(query), "json"), json.dumps(results, indent=2))
+
+    def save_page(self, url: str, html: str):
+        self._write(self._path("pages", hash_url(url), "html"), html)
+
+    # ------------------------------------------------------------------ synthetic content
+
+    def _synthetic_results(self, query: str, max_results: int) -> List[Dict]:
+        key = hash_query(query)
+        rng = random.Random(key)
+        return [{"title": f"{query.strip()} - {' '.join(rng.sample(_WORDS, 3))}",
+                 "body": self._sentence(rng, 24),
+                 "href": f"https://fixtures.local/{key[:16]}/{i}"} for i in range(max_results)]
+
+    def _synthetic_page(self, url: str) -> str:
+        rng = random.Random(hash_url(url))
+        paragraphs = "\n".join(f"<p>{' '.join(self._sentence(rng, 18) for _ in range(4))}</p>"
+                               for _ in range(self.page_paragraphs))
+        title = " ".join(rng.sample(_WORDS, 4)).title()
+        return (f"<html><head><title>{title}</title></head><body><article><h1>{title}</h1>\n"
+                f"{paragraphs}\n</article></body></html>")
+
+    @staticmethod
+    def _sentence(rng: random.Random, words: int) -> str:
+        return " ".join(rng.choice(_WORDS) for _ in range(words)).capitalize() + "."
+
+    # ------------------------------------------------------------------ backend interface
+
+    async def _delay(self, base: float):
+        delay = base + (self._latency.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0: await asyncio.sleep(delay)
+
+    def _inject_search_fault(self, query: str):
+        roll = self._faults.random()
+        if roll < self.throttle_rate:
+            self.stats["injected_throttles"] += 1
+            raise SearchThrottled(f"Injected rate limit for {query!r}")
+        if roll < self.throttle_rate + self.timeout_rate:
+            self.stats["injected_timeouts"] += 1
+            raise asyncio.TimeoutError(f"Injected timeout for {query!r}")
+        if roll < self.throttle_rate + self.timeout_rate + self.failure_rate:
+            self.stats["injected_failures"] += 1
+            raise SearchError(f"Injected failure for {query!r}")
+
+    async def search(self, query: str, max_results: int) -> List[Dict]:
+        self.stats["searches"] += 1
+        await self._delay(self.search_latency)
+        self._inject_search_fault(query)
+        canned = self._read(self._path("results", hash_query(query), "json"))
+        if canned is not None:
+            self.stats["fixture_hits"] += 1
+            return json.loads(canned)[:max_results]
+        if not self.synthesize: return []
+        self.stats["synthesized"] += 1
+        return self._synthetic_results(query, max_results)
+
+    async def fetch(self, url: str, timeout: Optional[float] = None,
+                    headers: Optional[Dict[str, str]] = None) -> ScrapedPage:
+        self.stats["fetches"] += 1
+        await self._delay(self.fetch_latency)
+        if self._faults.random() < self.fetch_failure_rate:
+            self.stats["injected_failures"] += 1
+            raise httpx.ConnectError(f"Injected fetch failure for {url}")
+        html = self._read(self._path("pages", hash_url(url), "html"))
+        if html is not None:
+            self.stats["fixture_hits"] += 1
+        elif self.synthesize:
+            self.stats["synthesized"] += 1
+            html = self._synthetic_page(url)
+        else:
+            request = httpx.Request("GET", url)
+            raise httpx.HTTPStatusError("No fixture for page", request=request,
+                                        response=httpx.Response(404, request=request))
+        etag = f'"{hash_content(html)[:16]}"'
+        if headers and headers.get("If-None-Match") == etag:
+            return ScrapedPage(url=url, status=304, etag=etag)
+        text = await get_executor("extract").run(_extract_text, html)
+        return ScrapedPage(url=url, status=200, text=text, etag=etag)
+
+    def snapshot(self) -> Dict:
+        return {"name": self.name, "root": self.root, **self.stats}
@@ -0,0 +1,154 @@
+"""
+ddg_metrics.py - In-process counters and histograms in the Prometheus text format
+
+Usage:
+    from ddg_metrics import STAGE_SECONDS, render_metrics
+    with STAGE_SECONDS.time(stage="search"):
+        ...
+    text = render_metrics()    # served by ddg_api.py at GET /metrics
+
+Metrics are updated from the event loop and from worker threads, so every update
+takes a short per-metric lock. Nothing here touches the database.
+"""
+import bisect, threading, time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Tuple
+
+Labels = Tuple[Tuple[str, str], ...]
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+def _labels(labels: Dict[str, object]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r'\"')
+
+def _format(name: str, labels: Labels, value: float, extra: Labels = ()) -> str:
+    pairs = ",".join(f'{k}="{_escape(v)}"' for k, v in (*labels, *extra))
+    number = "+Inf" if value == float("inf") else repr(float(value)) if isinstance(value, float) else str(value)
+    return f"{name}{{{pairs}}} {number}" if pairs else f"{name} {number}"
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str):
+        self.name, self.help = name, help
+        self._lock = threading.Lock()
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        return "\n".join([f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}", *self.samples()])
+
+class Counter(Metric):
+    """Monotonic count per label set"""
+    kind = "counter"
+
+    def __init__(self, name: str, help: str):
+        super().__init__(name, help)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = _labels(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(_labels(labels), 0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            return [_format(self.name, key, value) for key, value in sorted(self._values.items())]
+
+class Histogram(Metric):
+    """Cumulative-bucket histogram per label set (bucket counts, _sum and _count)"""
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, buckets: Iterable[float] = LATENCY_BUCKETS):
+        super().__init__(name, help)
+        self.buckets = tuple(sorted(buckets))
+        self._values: Dict[Labels, List] = {}  # labels -> [per-bucket counts (+Inf last), sum, count]
+
+    def observe(self, value: float, **labels):
+        key = _labels(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][bisect.bisect_left(self.buckets, value)] += 1
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of the with-block in seconds (also when it raises)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self) -> List[str]:
+        lines = []
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, n in zip((*self.buckets, float("inf")), counts):
+                    cumulative += n
+                    le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                    lines.append(_format(f"{self.name}_bucket", key, cumulative, (("le", le),)))
+                lines.append(_format(f"{self.name}_sum", key, total))
+                lines.append(_format(f"{self.name}_count", key, count))
+        return lines
+
+class GaugeFunc(Metric):
+    """Gauge read at render time: fn() returns [(labels, value)]"""
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, fn: Callable[[], Iterable[Tuple[Dict[str, object], float]]]):
+        super().__init__(name, help)
+        self.fn = fn
+
+    def samples(self) -> List[str]:
+        return [_format(self.name, _labels(labels), value) for labels, value in self.fn()]
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        """Add metric (re-registering a name replaces it, so module reloads stay consistent)"""
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        blocks = []
+        for metric in list(self._metrics.values()):
+            try:
+                blocks.append(metric.render())
+            except Exception as e:  # A failing gauge callback must not take the endpoint down
+                blocks.append(f"# {metric.name} unavailable: {e!r}")
+        return "\n".join(blocks) + "\n"
+
+REGISTRY = Registry()
+
+def render_metrics() -> str:
+    return REGISTRY.render()
+
+# ============================================================================
+# Shared Metrics
+# ============================================================================
+
+HTTP_SECONDS = REGISTRY.register(Histogram(
+    "ddg_http_request_duration_seconds", "HTTP request latency by method, route and status"))
+SEARCH_REQUESTS = REGISTRY.register(Counter(
+    "ddg_search_requests_total", "Answered searches by source (cache-exact, cache-similarity, mixed, live, "
+                                 "cache-fallback, none, error); hit ratio = cache-* / all"))
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    "ddg_stage_duration_seconds", "Pipeline work by stage: embed (model batch), db (statement), search "
+                                  "(backend call), scrape (page fetch), summarize (LLM summary)"))
+EMBED_BATCH_SIZE = REGISTRY.register(Histogram(
+    "ddg_embedder_batch_size", "Texts per embedding model call", buckets=SIZE_BUCKETS))
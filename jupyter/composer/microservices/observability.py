@@ -2,6 +2,7 @@
 
 import os
 import logging
+from functools import wraps
 
 def get_observability(service_name: str = "default-service", DEBUG_MODE=None):
     if DEBUG_MODE is None:
@@ -38,6 +39,7 @@ def get_observability(service_name: str = "default-service", DEBUG_MODE=None):
 
         def traced(name: str):
             def decorator(func):
+                @wraps(func)  # keep the signature: FastAPI reads endpoint parameters from it
                 async def wrapper(*args, **kwargs):
                     with tracer.start_as_current_span(name, kind=SpanKind.INTERNAL) as span:
                         span.set_attribute("function", func.__name__)
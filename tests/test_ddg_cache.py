@@ -0,0 +1,196 @@
+"""
+Regression tests for the DDG cache service's concurrency and failure handling
+
+Runs offline: searches and pages come from LocalFixtureBackend, the cache lives in a
+per-test SQLite file and embeddings come from ddg_bench's HashEmbedder.
+
+    pytest tests/test_ddg_cache.py
+"""
+import asyncio
+import os
+import sys
+
+import pytest
+
+os.environ.setdefault("DDG_EMBED_DIM", "16")
+os.environ.setdefault("DDG_SEARCH_RATE", "0")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "jupyter", "composer", "microservices"))
+
+pytest.importorskip("aiosqlite")
+import httpx
+import ddg_cache as dc
+from ddg_bench import HashEmbedder
+from ddg_fixtures import LocalFixtureBackend
+
+
+@pytest.fixture(autouse=True)
+def cache_env(tmp_path, monkeypatch):
+    """Fresh database, search gateway (breaker) and embedder per test"""
+    monkeypatch.setenv("DATABASE_URL", f"sqlite+aiosqlite:///{tmp_path}/cache.db")
+    monkeypatch.setenv("DDG_BREAKER_FAILURES", "1")
+    monkeypatch.setattr(dc, "_search_gateway", None)
+    dc.get_embedding_service()._model = HashEmbedder(16)
+    return tmp_path
+
+
+def run(body, backend):
+    """Run body() on a fresh loop with backend installed and an initialized cache"""
+    async def main():
+        dc.set_search_backend(backend)
+        await dc.init_database()
+        try:
+            return await body()
+        finally:
+            await dc.shutdown_cache()
+    return asyncio.run(main())
+
+
+def fixtures(tmp_path, **options) -> LocalFixtureBackend:
+    return LocalFixtureBackend(str(tmp_path / "fixtures"), **options)
+
+
+# ============================================================================
+# Single-Flight Sharing
+# ============================================================================
+
+def test_concurrent_searches_share_one_live_search(tmp_path):
+    backend = fixtures(tmp_path, search_latency=0.2)
+
+    async def body():
+        first, second = await asyncio.gather(dc.cached_ddg_search("gpu kernels", max_results=5),
+                                             dc.cached_ddg_search("gpu kernels", max_results=5))
+        assert first["source"] == second["source"] == "live"
+        assert first["results"] == second["results"] and first["results"] is not second["results"]
+    run(body, backend)
+    assert backend.stats["searches"] == 1
+
+
+def test_search_and_batch_share_one_live_search(tmp_path):
+    import ddg_api
+    backend = fixtures(tmp_path, search_latency=0.3)
+
+    async def body():
+        transport = httpx.ASGITransport(app=ddg_api.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            batch = {"queries": ["gpu kernels"], "max_results_per_query": 5}
+            responses = await asyncio.gather(
+                client.post("/search", json={"query": "gpu kernels", "max_results": 5}),
+                client.post("/search/batch", json=batch))
+            assert [r.status_code for r in responses] == [200, 200]
+            assert backend.stats["searches"] == 1
+
+            batch = {"queries": ["cpu caches"], "max_results_per_query": 5}
+            responses = await asyncio.gather(*[client.post("/search/batch", json=batch) for _ in range(2)])
+            assert [r.status_code for r in responses] == [200, 200]
+            assert backend.stats["searches"] == 2
+        assert (await dc.reconcile_cache_stats())["total"] == 2  # Followers left saving to their leader
+    run(body, backend)
+
+
+def test_batch_resolves_duplicate_queries_once(tmp_path):
+    backend = fixtures(tmp_path)
+
+    async def body():
+        answers = await dc.batch_ddg_search(["Vector Index", "vector index", "  VECTOR index "], max_results=3)
+        assert [a["source"] for a in answers] == ["live"] * 3
+        assert answers[0]["results"] == answers[2]["results"] and answers[0] is not answers[2]
+    run(body, backend)
+    assert backend.stats["searches"] == 1
+
+
+def test_cancelled_caller_does_not_cancel_shared_work():
+    flights = dc.SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.1)
+        return {"value": 1}
+
+    async def body():
+        leader = asyncio.ensure_future(flights.do("key", work, copy_result=True))
+        await asyncio.sleep(0.01)
+        follower = asyncio.ensure_future(flights.do("key", work, copy_result=True))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        outcomes = await asyncio.gather(leader, follower, return_exceptions=True)
+        assert isinstance(outcomes[0], asyncio.CancelledError)
+        assert outcomes[1] == {"value": 1}
+        assert "key" not in flights
+    asyncio.run(body())
+
+
+# ============================================================================
+# Circuit Breaker & Failure Isolation
+# ============================================================================
+
+def test_breaker_opens_and_batch_falls_back_to_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("DDG_BREAKER_FALLBACK_THRESHOLD", "-1")
+    backend = fixtures(tmp_path, failure_rate=1.0)
+
+    async def body():
+        await dc.save_to_cache("gpu kernels", [{"title": "t", "body": "b", "href": "https://example.com/1"}])
+        with pytest.raises(dc.SearchError):
+            await dc.search_duckduckgo("anything")
+        assert dc.get_search_gateway().breaker.state == "open"
+        with pytest.raises(dc.SearchUnavailable):
+            await dc.search_duckduckgo("anything")
+
+        answers = await dc.batch_ddg_search(["unrelated topic"], max_results=1, similarity_threshold=1.01)
+        assert answers[0]["source"] == "cache-fallback"
+        assert answers[0]["results"][0]["href"] == "https://example.com/1"
+    run(body, backend)
+    assert backend.stats["searches"] == 1  # Open breaker: no further backend calls
+
+
+def test_cancelled_half_open_trial_frees_the_breaker(tmp_path, monkeypatch):
+    monkeypatch.setenv("DDG_BREAKER_RESET_SECONDS", "0.1")
+    backend = fixtures(tmp_path, search_latency=5.0)
+
+    async def body():
+        breaker = dc.get_search_gateway().breaker
+        breaker.record_failure()
+        await asyncio.sleep(0.15)
+        trial = asyncio.ensure_future(dc.search_duckduckgo("slow query"))
+        await asyncio.sleep(0.05)
+        trial.cancel()
+        await asyncio.gather(trial, return_exceptions=True)
+        assert breaker.state == "half_open" and breaker.allow()
+    run(body, backend)
+
+
+def test_throttle_classification_ignores_stray_digits():
+    from ddgs.exceptions import DDGSException, RatelimitException
+    assert dc._classify_search_error(DDGSException("failed in 2025, id=4202")) == "error"
+    assert dc._classify_search_error(DDGSException("Status code 429")) == "throttled"
+    assert dc._classify_search_error(RatelimitException("slow down")) == "throttled"
+
+
+def test_batch_reports_failing_queries_individually(tmp_path):
+    import ddg_api
+    backend = fixtures(tmp_path, failure_rate=1.0)
+
+    async def body():
+        transport = httpx.ASGITransport(app=ddg_api.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post("/search/batch", json={"queries": ["one", "two"], "use_cache": False})
+        assert response.status_code == 200
+        body = response.json()
+        assert body["failed"] == 2
+        assert all(r["source"] == "error" and not r["success"] for r in body["results"])
+    run(body, backend)
+
+
+# ============================================================================
+# L1 Invalidation
+# ============================================================================
+
+def test_writes_invalidate_l1_copies(tmp_path):
+    async def body():
+        await dc.save_to_cache("gpu kernels", [{"title": "old", "body": "b", "href": "https://example.com/1"}])
+        assert (await dc.get_cached_result("gpu kernels"))["results"][0]["title"] == "old"
+
+        await dc.save_to_cache("gpu kernels", [{"title": "new", "body": "b", "href": "https://example.com/1"}])
+        assert (await dc.get_cached_result("gpu kernels"))["results"][0]["title"] == "new"
+
+        assert await dc.delete_cache_entry(dc.hash_query("gpu kernels"))
+        assert await dc.get_cached_result("gpu kernels") is None
+    run(body, fixtures(tmp_path))